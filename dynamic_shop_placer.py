@@ -24,25 +24,50 @@ import omni.usd
 from pxr import Usd, UsdGeom, Gf, UsdPhysics, PhysxSchema
 import asyncio
 import numpy as np
-import random
-import math
+import copy
 import json
-from pathlib import Path
+import os
+
+try:
+    import orjson  # Optional: faster JSON parsing when available
+except ImportError:
+    orjson = None
 
 BASE_PATH = "/workspace/isaac_sim_dynamic_store/"
+PRODUCT_JSON = BASE_PATH + "assets/product_data.json"  # BASE_PATH ends with "/"
+EMPTY_SHOP_USDA = BASE_PATH + "assets/Shop Minimal Empty.usda"
 
 # Configuration
 ENABLE_PHYSICS_FOR_ALL = True  # Set to False to make all products static (no physics)
 FORCE_COLLISION_FOR_PHYSICS = True  # Ensure collision detection for physics-enabled products
 
+# Parsed product data keyed by (path, mtime_ns) so reruns in the same Isaac Sim
+# interpreter only re-parse the JSON when the file has changed
+_JSON_CACHE = globals().get("_JSON_CACHE", {})
+
 def load_product_data():
-    """Load product data from JSON file."""
-    json_file_path = Path(BASE_PATH) / "assets" / "product_data.json"
+    """Load product data from JSON file (cached until the file changes)."""
+    json_file_path = PRODUCT_JSON
     try:
-        with open(json_file_path, 'r') as f:
-            product_data = json.load(f)
-        print(f"Loaded product data from: {json_file_path}")
-        return product_data
+        key = (json_file_path, os.stat(json_file_path).st_mtime_ns)
+        cached = _JSON_CACHE.get(key)
+        if cached is not None:
+            print(f"Using cached product data from: {json_file_path}")
+        else:
+            if orjson is not None:
+                with open(json_file_path, 'rb') as f:
+                    cached = orjson.loads(f.read())
+            else:
+                with open(json_file_path, 'r') as f:
+                    cached = json.load(f)
+            
+            _JSON_CACHE.clear()
+            _JSON_CACHE[key] = cached
+            print(f"Loaded product data from: {json_file_path}")
+        
+        # Hand out a deep copy so runtime edits to PRODUCT_DATA (including in-place edits
+        # of the translate/rotate/scale lists) don't leak into later reruns
+        return copy.deepcopy(cached)
     except FileNotFoundError:
         print(f"ERROR: Product data file not found at: {json_file_path}")
         return {}
@@ -62,15 +87,14 @@ class DynamicShopPlacer:
     
     def __init__(self):
         self.stage = omni.usd.get_context().get_stage()
-        base_file = Path(BASE_PATH) / "assets" / "Shop Minimal Empty.usda"
-        self.empty_shop_path = str(base_file)
+        self.empty_shop_path = EMPTY_SHOP_USDA
         
     def load_empty_shop_sync(self):
         """Synchronous version of load_empty_shop for easier testing."""
         print("Loading empty shop environment...")
         
         # Open the empty shop USD file
-        success = omni.usd.get_context().open_stage(str(self.empty_shop_path))
+        success = omni.usd.get_context().open_stage(self.empty_shop_path)
         if not success:
             print(f"Failed to load empty shop from: {self.empty_shop_path}")
             return False
@@ -84,7 +108,7 @@ class DynamicShopPlacer:
         print("Loading empty shop environment...")
         
         # Open the empty shop USD file
-        success = await omni.usd.get_context().open_stage_async(str(self.empty_shop_path))
+        success = await omni.usd.get_context().open_stage_async(self.empty_shop_path)
         if not success:
             print(f"Failed to load empty shop from: {self.empty_shop_path}")
             return False
@@ -101,34 +125,32 @@ class DynamicShopPlacer:
             print("Warning: Could not find /World/Shelf in the loaded stage")
             return False
         
-        # Collect unique shelf levels and categories from product data
-        shelf_categories = {}
+        # Collect unique (shelf level, category) pairs from product data
+        pairs = {
+            (product_data.get("shelf", "Items_Lower"), product_data.get("category", "Unknown"))  # Default fallbacks
+            for product_data in PRODUCT_DATA.values()
+        }
+        shelves = {shelf_level for shelf_level, _ in pairs}
         
-        for product_id, product_data in PRODUCT_DATA.items():
-            shelf = product_data.get("shelf", "Items_Lower")  # Default fallback
-            category = product_data.get("category", "Unknown")  # Default fallback
-            
-            if shelf not in shelf_categories:
-                shelf_categories[shelf] = set()
-            shelf_categories[shelf].add(category)
-        
-        # Create shelf level scopes and category scopes dynamically
-        for shelf_level, categories in shelf_categories.items():
-            # Create shelf level scope (e.g., Items_Lower, Items_Upper, Items_Top)
-            shelf_path = f"/World/Shelf/{shelf_level}"
-            UsdGeom.Scope.Define(self.stage, shelf_path)
-            
-            # Create category scopes within this shelf level
-            for category in categories:
-                category_path = f"{shelf_path}/{category}"
-                UsdGeom.Scope.Define(self.stage, category_path)
+        # Create shelf level scopes first (e.g., Items_Lower, Items_Upper, Items_Top)
+        for shelf_level in shelves:
+            UsdGeom.Scope.Define(self.stage, f"/World/Shelf/{shelf_level}")
         
-        print(f"Created product hierarchy structure for {len(shelf_categories)} shelf levels")
-        print(f"Shelf levels: {list(shelf_categories.keys())}")
+        # Then create each category scope within its shelf level
+        for shelf_level, category in pairs:
+            UsdGeom.Scope.Define(self.stage, f"/World/Shelf/{shelf_level}/{category}")
+        
+        print(f"Created product hierarchy structure for {len(shelves)} shelf levels")
+        print(f"Shelf levels: {sorted(shelves)}")
         return True
         
-    def place_product(self, product_id, product_data):
-        """Place a single product in the scene with proper transforms and physics."""
+    def place_product(self, product_id, product_data, rotation_override=None):
+        """
+        Place a single product in the scene with proper transforms and physics.
+        
+        If rotation_override is given (see randomize_product_rotations), its
+        "rotate" or "orient" value is used instead of the one in product_data.
+        """
         # Get shelf and category from product metadata
         shelf_level = product_data.get("shelf", "Items_Lower")  # Default fallback
         category = product_data.get("category", "Unknown")  # Default fallback
@@ -153,14 +175,15 @@ class DynamicShopPlacer:
         scale_op.Set(Gf.Vec3f(*product_data["scale"]))
         
         # Handle rotation - some products use rotateZYX, others use orient (quaternion)
-        if "rotate" in product_data:
+        rotation_data = rotation_override or product_data
+        if "rotate" in rotation_data:
             # Use Euler rotation (ZYX order)
             rotation_op = xform.AddRotateZYXOp()
-            rotation_op.Set(Gf.Vec3f(*product_data["rotate"]))
-        elif "orient" in product_data:
+            rotation_op.Set(Gf.Vec3f(*rotation_data["rotate"]))
+        elif "orient" in rotation_data:
             # Use quaternion orientation
             rotation_op = xform.AddOrientOp()
-            quat_data = product_data["orient"]
+            quat_data = rotation_data["orient"]
             # Convert [w,x,y,z] to Gf.Quatf(w, Gf.Vec3f(x,y,z))
             rotation_op.Set(Gf.Quatf(quat_data[0], Gf.Vec3f(quat_data[1], quat_data[2], quat_data[3])))
             
@@ -174,7 +197,6 @@ class DynamicShopPlacer:
         physics_enabled = product_data.get("physics_enabled", False) and ENABLE_PHYSICS_FOR_ALL
         
         if physics_enabled:
-            print(f"  Adding physics to {product_id}...")
             # Add RigidBody API
             rigid_body_api = UsdPhysics.RigidBodyAPI.Apply(product_prim)
             rigid_body_api.CreateRigidBodyEnabledAttr(True)
@@ -206,7 +228,6 @@ class DynamicShopPlacer:
                         # For dynamic rigid bodies, ONLY use convex hull (never triangle mesh)
                         try:
                             convex_hull_api = PhysxSchema.PhysxConvexHullCollisionAPI.Apply(child_prim)
-                            print(f"    Added convex hull collision for {product_id}")
                             collision_applied = True
                         except Exception as e:
                             print(f"    Warning: Could not add convex hull collision to {product_id}: {e}")
@@ -216,7 +237,6 @@ class DynamicShopPlacer:
                     try:
                         # Apply collision directly to the product prim using box approximation
                         collision_api.CreateCollisionEnabledAttr(True)
-                        print(f"    Using default collision approximation for {product_id}")
                     except Exception as e:
                         print(f"    Warning: Could not add any collision to {product_id}: {e}")
             
@@ -225,86 +245,76 @@ class DynamicShopPlacer:
                 rigid_body_api.CreateVelocityAttr(Gf.Vec3f(*product_data["velocity"]))
             if "angular_velocity" in product_data:
                 rigid_body_api.CreateAngularVelocityAttr(Gf.Vec3f(*product_data["angular_velocity"]))
-        else:
-            print(f"  {product_id} set as static (no physics)")
                 
-        print(f"Placed product: {product_id} at {product_data['translate']} (shelf: {shelf_level}, category: {category})")
         return True
         
     def randomize_product_rotations(self, product_data_dict, num_products=3):
         """
-        Randomly select and randomize rotation properties of specified number of products.
+        Randomly select products and generate new rotation properties for them.
+        
+        The product data itself is not copied or modified; instead a small dict of
+        rotation overrides is returned and applied by place_product().
         
         Args:
-            product_data_dict (dict): The product data dictionary to modify
+            product_data_dict (dict): The product data dictionary to sample from
             num_products (int): Number of products to randomize (default: 3)
-        """
-        # Create a copy to avoid modifying the original
-        randomized_data = product_data_dict.copy()
         
-        # Get list of product IDs
-        product_ids = list(randomized_data.keys())
+        Returns:
+            dict: product ID -> {"rotate": [x, y, z]} or {"orient": [w, x, y, z]}
+        """
+        rng = np.random.default_rng()
         
         # Randomly select products to randomize
-        selected_products = random.sample(product_ids, min(num_products, len(product_ids)))
+        product_ids = list(product_data_dict.keys())
+        num_selected = min(num_products, len(product_ids))
+        selected_products = [product_ids[i] for i in rng.choice(len(product_ids), size=num_selected, replace=False)]
         
         print(f"Randomizing rotations for products: {selected_products}")
         
-        for product_id in selected_products:
-            product_data = randomized_data[product_id].copy()
+        # Products with Euler angles (or no rotation at all) get new Euler angles,
+        # products with quaternions get a new quaternion
+        euler_ids = [product_id for product_id in selected_products
+                     if "rotate" in product_data_dict[product_id] or "orient" not in product_data_dict[product_id]]
+        quat_ids = [product_id for product_id in selected_products if product_id not in euler_ids]
+        
+        overrides = {}
+        
+        # Euler angles (ZYX order) in degrees, one row per product
+        rotations = rng.uniform(-180.0, 180.0, size=(len(euler_ids), 3)).tolist()
+        for product_id, random_rotation in zip(euler_ids, rotations):
+            overrides[product_id] = {"rotate": random_rotation}
+        
+        # Random unit quaternions (w, x, y, z) using the Marsaglia method
+        u1, u2, u3 = rng.random((3, len(quat_ids)))
+        quats = np.stack([
+            np.sqrt(u1) * np.cos(2 * np.pi * u3),
+            np.sqrt(1 - u1) * np.sin(2 * np.pi * u2),
+            np.sqrt(1 - u1) * np.cos(2 * np.pi * u2),
+            np.sqrt(u1) * np.sin(2 * np.pi * u3),
+        ], axis=1).tolist()
+        for product_id, random_quat in zip(quat_ids, quats):
+            overrides[product_id] = {"orient": random_quat}
             
-            # Generate random rotation values
-            if "rotate" in product_data or "orient" not in product_data:
-                # Use Euler angles (ZYX order) - generate random rotations in degrees
-                random_rotation = [
-                    random.uniform(-180, 180),  # X rotation
-                    random.uniform(-180, 180),  # Y rotation  
-                    random.uniform(-180, 180)   # Z rotation
-                ]
-                product_data["rotate"] = random_rotation
-                # Remove orient if it exists to avoid conflicts
-                if "orient" in product_data:
-                    del product_data["orient"]
-                print(f"  {product_id}: New rotation = {random_rotation}")
-            else:
-                # Generate random quaternion orientation
-                # Create random unit quaternion using Marsaglia method
-                u1, u2, u3 = random.random(), random.random(), random.random()
-                q1 = math.sqrt(1 - u1) * math.sin(2 * math.pi * u2)
-                q2 = math.sqrt(1 - u1) * math.cos(2 * math.pi * u2)
-                q3 = math.sqrt(u1) * math.sin(2 * math.pi * u3)
-                q0 = math.sqrt(u1) * math.cos(2 * math.pi * u3)
-                random_quat = [float(q0), float(q1), float(q2), float(q3)]  # (w, x, y, z)
-                
-                product_data["orient"] = random_quat
-                # Remove rotate if it exists to avoid conflicts
-                if "rotate" in product_data:
-                    del product_data["rotate"]
-                print(f"  {product_id}: New orientation = {random_quat}")
-            
-            # Update the data
-            randomized_data[product_id] = product_data
-            
-        return randomized_data
+        return overrides
         
     def place_all_products(self):
         """Place all products from the product data."""
         print("Placing all products...")
         
         # Randomize 3 products before placing
-        randomized_product_data = self.randomize_product_rotations(PRODUCT_DATA, num_products=3)
+        rotation_overrides = self.randomize_product_rotations(PRODUCT_DATA, num_products=3)
         success_count = 0
         
-        for product_id, product_data in randomized_product_data.items():
+        for product_id, product_data in PRODUCT_DATA.items():
             try:
-                if self.place_product(product_id, product_data):
+                if self.place_product(product_id, product_data, rotation_overrides.get(product_id)):
                     success_count += 1
                 else:
                     print(f"Failed to place product: {product_id}")
             except Exception as e:
                 print(f"Error placing product {product_id}: {str(e)}")
                 
-        print(f"Successfully placed {success_count} out of {len(randomized_product_data)} products")
+        print(f"Successfully placed {success_count} out of {len(PRODUCT_DATA)} products")
         return success_count > 0
         
     def setup_scene_sync(self):
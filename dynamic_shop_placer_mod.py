@@ -15,13 +15,22 @@ Flags:
 """
 
 import omni.usd
-from pxr import Usd, UsdGeom, Gf, UsdPhysics, PhysxSchema, Sdf
+from pxr import Usd, UsdGeom, Gf, UsdPhysics, PhysxSchema, Sdf, Vt
 import random
 import math
+import copy
 import json
-from pathlib import Path
+import os
+from collections import namedtuple
+
+try:
+    import orjson  # optional, noticeably faster than json for the product catalog
+except ImportError:
+    orjson = None
 
 BASE_PATH = "/workspace/isaac_sim_dynamic_store/"
+PRODUCT_JSON = BASE_PATH + "assets/product_data.json"  # BASE_PATH ends with "/"
+EMPTY_SHOP_USDA = BASE_PATH + "assets/Shop Minimal Empty.usda"
 
 # ==============================
 # USER FLAGS
@@ -44,15 +53,108 @@ SHELF_WORLD_XFORM_MODE = "additive"  # "additive" or "override"
 ENABLE_PHYSICS_FOR_ALL = True
 FORCE_COLLISION_FOR_PHYSICS = True
 
+# The only xformOpOrder values place_product authors. VtArrays are copy-on-write,
+# so every product prim shares one of these instead of allocating its own.
+_ORDER_TRS = Vt.TokenArray(["xformOp:translate", "xformOp:rotateZYX", "xformOp:scale"])
+_ORDER_TOS = Vt.TokenArray(["xformOp:translate", "xformOp:orient", "xformOp:scale"])
+_ORDER_TS = Vt.TokenArray(["xformOp:translate", "xformOp:scale"])
+
+
+# customData key recording what the placer last authored on a prim, so reruns
+# with unchanged inputs leave the prim (and Hydra) alone.
+_PLACER_SIG_KEY = "placer_sig"
+
+
+def _placement_signature(product_data):
+    return repr((
+        product_data["asset"],
+        product_data["translate"],
+        product_data["scale"],
+        product_data.get("rotate"),
+        product_data.get("orient"),
+    ))
+
+
+def _xform_values(product_data):
+    """
+    Gf values for a product's xform ops:
+    (translate, scale, rotation_op_name, rotation_type, rotation, op_order).
+    rotation_op_name/rotation_type/rotation are None when the product has no rotation.
+    """
+    translate = Gf.Vec3d(*product_data["translate"])
+    scale = Gf.Vec3f(*product_data["scale"])
+    if "rotate" in product_data:
+        rotation = Gf.Vec3f(*product_data["rotate"])
+        return translate, scale, "xformOp:rotateZYX", Sdf.ValueTypeNames.Float3, rotation, _ORDER_TRS
+    if "orient" in product_data:
+        q = product_data["orient"]
+        rotation = Gf.Quatf(q[0], Gf.Vec3f(q[1], q[2], q[3]))
+        return translate, scale, "xformOp:orient", Sdf.ValueTypeNames.Quatf, rotation, _ORDER_TOS
+    return translate, scale, None, None, None, _ORDER_TS
+
+
+# Everything needed to author one product, resolved up front by
+# DynamicShopPlacer._placement_record(). The last six fields are _xform_values().
+PlacementRecord = namedtuple("PlacementRecord", [
+    "product_id", "category_path", "product_path", "sig", "payload",
+    "translate", "scale", "rotation_op_name", "rotation_type", "rotation", "op_order",
+])
+
+
+# One Sdf.Payload per distinct asset identifier (most products share an asset).
+# Identifiers are authored as-is; composition resolves them when the payloads load.
+_PAYLOADS = {}
+
+
+def _payload_for(asset):
+    payload = _PAYLOADS.get(asset)
+    if payload is None:
+        payload = _PAYLOADS[asset] = Sdf.Payload(assetPath=asset)
+    return payload
+
+
+# Parsed product data keyed by (path, mtime_ns). Kept across reruns of this script
+# in the same interpreter so the JSON is only parsed again when the file changes.
+_JSON_CACHE = globals().get("_JSON_CACHE", {})
+
+# Gf xform values of the cached JSON entries keyed by (product_id, placement signature).
+# Kept and rebuilt together with _JSON_CACHE; keying by the signature means an entry
+# edited after load simply misses and is converted in _placement_record.
+_XFORM_VALUES = globals().get("_XFORM_VALUES", {})
+
 
 def load_product_data():
-    """Load product data from JSON file."""
-    json_file_path = Path(BASE_PATH) / "assets" / "product_data.json"
+    """Load product data from JSON file (cached until the file changes)."""
+    json_file_path = PRODUCT_JSON
     try:
-        with open(json_file_path, "r") as f:
-            product_data = json.load(f)
-        print(f"Loaded product data from: {json_file_path}")
-        return product_data
+        key = (json_file_path, os.stat(json_file_path).st_mtime_ns)
+        cached = _JSON_CACHE.get(key)
+        if cached is not None:
+            print(f"Using cached product data from: {json_file_path}")
+        else:
+            if orjson is not None:
+                with open(json_file_path, "rb") as f:
+                    cached = orjson.loads(f.read())
+            else:
+                with open(json_file_path, "r") as f:
+                    cached = json.load(f)
+
+            # Convert transforms to Gf values once per file change rather than once per run.
+            # Malformed entries are skipped here so place_product reports them individually.
+            _XFORM_VALUES.clear()
+            for product_id, entry in cached.items():
+                try:
+                    _XFORM_VALUES[(product_id, _placement_signature(entry))] = _xform_values(entry)
+                except (KeyError, IndexError, TypeError):
+                    pass
+
+            _JSON_CACHE.clear()
+            _JSON_CACHE[key] = cached
+            print(f"Loaded product data from: {json_file_path}")
+
+        # Hand out a deep copy so runtime edits to PRODUCT_DATA (including in-place edits
+        # of the translate/rotate/scale lists) don't leak into the cache and later reruns
+        return copy.deepcopy(cached)
     except Exception as e:
         print(f"ERROR loading product data: {e}")
         return {}
@@ -61,11 +163,86 @@ def load_product_data():
 PRODUCT_DATA = load_product_data()
 
 
+# ------------------------------------------------------------------
+# Sdf authoring helpers: write specs straight onto a layer so that, inside an
+# Sdf.ChangeBlock, the stage recomposes once instead of after every edit.
+# ------------------------------------------------------------------
+def _define_prim_spec(layer, path, type_name=""):
+    prim_spec = Sdf.CreatePrimInLayer(layer, Sdf.Path(path))
+    prim_spec.specifier = Sdf.SpecifierDef
+    if type_name:
+        prim_spec.typeName = type_name
+    return prim_spec
+
+
+def _set_attribute_spec(layer, prim_spec, name, type_name, value, variability=Sdf.VariabilityVarying):
+    attr_spec = layer.GetAttributeAtPath(prim_spec.path.AppendProperty(name))
+    if not attr_spec:
+        attr_spec = Sdf.AttributeSpec(prim_spec, name, type_name, variability)
+    attr_spec.default = value
+    return attr_spec
+
+
+def _author_product(layer, record):
+    """Author one product from a PlacementRecord onto ``layer``."""
+    # Nothing to do if this product was already authored from the same data
+    prim_spec = layer.GetPrimAtPath(record.product_path)
+    if prim_spec and prim_spec.GetInfo("customData").get(_PLACER_SIG_KEY) == record.sig:
+        return
+
+    if prim_spec:
+        prim_spec.specifier = Sdf.SpecifierDef
+    else:
+        # The category scope normally exists already (create_product_hierarchy)
+        parent_spec = (
+            layer.GetPrimAtPath(record.category_path)
+            or _define_prim_spec(layer, record.category_path, "Scope")
+        )
+        prim_spec = Sdf.PrimSpec(parent_spec, record.product_id, Sdf.SpecifierDef)
+
+    if record.payload not in prim_spec.payloadList.prependedItems:
+        prim_spec.payloadList.prependedItems.append(record.payload)
+
+    # Same ops UsdGeom.Xform would author (translate double3, rotate/scale float3),
+    # written as attribute specs. Existing op attributes are updated in place.
+    _set_attribute_spec(layer, prim_spec, "xformOp:translate", Sdf.ValueTypeNames.Double3, record.translate)
+    _set_attribute_spec(layer, prim_spec, "xformOp:scale", Sdf.ValueTypeNames.Float3, record.scale)
+    if record.rotation_op_name:
+        _set_attribute_spec(layer, prim_spec, record.rotation_op_name, record.rotation_type, record.rotation)
+
+    # xformOpOrder is only rewritten when the op kinds changed (e.g. rotate -> orient);
+    # ops missing from it are ignored, so stale ones from earlier runs do no harm
+    order_spec = layer.GetAttributeAtPath(record.product_path.AppendProperty("xformOpOrder"))
+    if not order_spec or list(order_spec.default or ()) != list(record.op_order):
+        _set_attribute_spec(
+            layer, prim_spec, "xformOpOrder", Sdf.ValueTypeNames.TokenArray, record.op_order, Sdf.VariabilityUniform
+        )
+
+    custom_data = dict(prim_spec.GetInfo("customData"))
+    custom_data[_PLACER_SIG_KEY] = record.sig
+    prim_spec.SetInfo("customData", custom_data)
+
+
+def _child_prim_spec(layer, parent_spec, name, type_name=""):
+    """Return the ``def`` child spec ``name`` of ``parent_spec``, creating it if missing."""
+    prim_spec = layer.GetPrimAtPath(parent_spec.path.AppendChild(name))
+    if not prim_spec:
+        return Sdf.PrimSpec(parent_spec, name, Sdf.SpecifierDef, type_name)
+    prim_spec.specifier = Sdf.SpecifierDef
+    if type_name:
+        prim_spec.typeName = type_name
+    return prim_spec
+
+
 class DynamicShopPlacer:
     def __init__(self):
-        self.stage = omni.usd.get_context().get_stage()
-        base_file = Path(BASE_PATH) / "assets" / "Shop Minimal Empty.usda"
-        self.empty_shop_path = str(base_file)
+        # Looked up once; omni.usd.get_context() and GetEditTarget() are not free
+        self._usd_context = omni.usd.get_context()
+        self.stage = self._usd_context.get_stage()
+        self._layer = self.stage.GetEditTarget().GetLayer() if self.stage else None
+        self.empty_shop_path = EMPTY_SHOP_USDA
+        # (shelf, category) -> Sdf.Path of the category scope, filled by create_product_hierarchy
+        self.category_paths = {}
 
     # ------------------------------------------------------------------
     # NEW: apply a world-space transform to /World/Shelf
@@ -79,29 +256,62 @@ class DynamicShopPlacer:
             print("ERROR: Cannot apply world transform: /World/Shelf does not exist.")
             return False
 
+        # An identity additive xform should leave the shelf at the pose its asset authors.
+        # Authoring it as ops would instead replace the asset's op order (moving the shelf
+        # to the origin), so author nothing and only remove what an earlier run wrote.
+        is_identity = (
+            tuple(SHELF_WORLD_TRANSLATE) == (0, 0, 0)
+            and tuple(SHELF_WORLD_ROTATE_ZYX_DEG) == (0, 0, 0)
+            and SHELF_WORLD_XFORM_MODE.lower() != "override"
+        )
+        if is_identity:
+            self._clear_shelf_world_transform(shelf_prim)
+            return True
+
+        shelf_sig = repr((
+            "transform",
+            SHELF_WORLD_XFORM_MODE.lower(),
+            tuple(SHELF_WORLD_TRANSLATE),
+            tuple(SHELF_WORLD_ROTATE_ZYX_DEG),
+        ))
+        if shelf_prim.GetCustomDataByKey(_PLACER_SIG_KEY) == shelf_sig:
+            print("Shelf world xform unchanged, skipping.")
+            return True
+
         xform = UsdGeom.Xform(shelf_prim)
 
         # In override mode, we reset xform stack so the referenced shelf's authored transforms are ignored
-        if SHELF_WORLD_XFORM_MODE.lower() == "override":
-            # Reset means: only the ops authored here define the transform stack
-            xform.SetResetXformStack(True)
+        # (only the ops authored here define the transform stack). Additive mode keeps referenced shelf
+        # transforms and composes additional ops here.
+        reset_xform_stack = SHELF_WORLD_XFORM_MODE.lower() == "override"
+
+        # Same result as the op stack [translate, rotateZYX], folded into one matrix so
+        # the xform cache reads a single attribute: rotate about Z, then Y, then X,
+        # then translate
+        rx, ry, rz = SHELF_WORLD_ROTATE_ZYX_DEG
+        rotation = (
+            Gf.Rotation(Gf.Vec3d.ZAxis(), rz)
+            * Gf.Rotation(Gf.Vec3d.YAxis(), ry)
+            * Gf.Rotation(Gf.Vec3d.XAxis(), rx)
+        )
+        m = Gf.Matrix4d(1.0)
+        m.SetRotate(rotation)
+        m.SetTranslateOnly(Gf.Vec3d(*SHELF_WORLD_TRANSLATE))
+
+        ops = xform.GetOrderedXformOps()
+        if len(ops) == 1 and ops[0].GetName() == "xformOp:transform":
+            # Warm path (rerun with new values): update the existing op in place
+            ops[0].Set(m)
+            if xform.GetResetXformStack() != reset_xform_stack:
+                xform.SetResetXformStack(reset_xform_stack)
         else:
-            # Additive mode: keep referenced shelf transforms, and compose additional ops here
-            xform.SetResetXformStack(False)
-
-        # Clear ops on the referencing prim so reruns don't accumulate multiple translate/rotate ops
-        xform.ClearXformOpOrder()
-
-        t = Gf.Vec3d(*SHELF_WORLD_TRANSLATE)
-        r = Gf.Vec3f(*SHELF_WORLD_ROTATE_ZYX_DEG)
-
-        translate_op = xform.AddTranslateOp()
-        translate_op.Set(t)
-
-        rotate_op = xform.AddRotateZYXOp()
-        rotate_op.Set(r)
-
-        xform.SetXformOpOrder([translate_op, rotate_op])
+            # Clear ops on the referencing prim so reruns don't accumulate multiple ops.
+            # The reset flag is written together with the op order, since ClearXformOpOrder drops it.
+            xform.ClearXformOpOrder()
+            transform_op = xform.AddTransformOp()
+            transform_op.Set(m)
+            xform.SetXformOpOrder([transform_op], reset_xform_stack)
+        shelf_prim.SetCustomDataByKey(_PLACER_SIG_KEY, shelf_sig)
 
         print(
             f"Applied Shelf world xform ({SHELF_WORLD_XFORM_MODE}): "
@@ -109,18 +319,41 @@ class DynamicShopPlacer:
         )
         return True
 
+    def _clear_shelf_world_transform(self, shelf_prim):
+        """Remove the shelf world xform opinions an earlier run authored on the edit layer."""
+        layer = self._layer
+        prim_spec = layer.GetPrimAtPath(shelf_prim.GetPath())
+        if not prim_spec:
+            return
+        custom_data = dict(prim_spec.GetInfo("customData"))
+        if _PLACER_SIG_KEY not in custom_data:
+            return
+
+        with Sdf.ChangeBlock():
+            for name in ("xformOpOrder", "xformOp:transform"):
+                attr_spec = layer.GetAttributeAtPath(prim_spec.path.AppendProperty(name))
+                if attr_spec:
+                    prim_spec.RemoveProperty(attr_spec)
+            del custom_data[_PLACER_SIG_KEY]
+            if custom_data:
+                prim_spec.SetInfo("customData", custom_data)
+            else:
+                prim_spec.ClearInfo("customData")
+        print("Removed Shelf world xform applied by an earlier run.")
+
     # ------------------------------------------------------------------
     # NEW: add shelf INTO EXISTING SCENE (no stage change)
     # ------------------------------------------------------------------
     def add_shelf_to_existing_stage(self):
         """
-        References /World/Shelf from the empty shop USD
-        into the currently open GUI scene.
+        Brings /World/Shelf from the empty shop USD into the currently open
+        GUI scene as a payload, then loads it explicitly.
         """
-        self.stage = omni.usd.get_context().get_stage()
+        self.stage = self._usd_context.get_stage()
         if not self.stage:
             print("ERROR: No stage open in the GUI.")
             return False
+        self._layer = self.stage.GetEditTarget().GetLayer()
 
         target_shelf_path = "/World/Shelf"
         src_prim_path = "/World/Shelf"
@@ -129,17 +362,27 @@ class DynamicShopPlacer:
         if not shelf_prim or not shelf_prim.IsValid():
             shelf_prim = UsdGeom.Xform.Define(self.stage, target_shelf_path).GetPrim()
 
-        # Clear old references if rerunning
-        shelf_prim.GetReferences().ClearReferences()
+        # Payload the shelf ONLY (not the full scene). Unlike a reference, a payload
+        # can stay unloaded, so its composition is under our control via Load()
+        shelf_payload = Sdf.Payload(assetPath=self.empty_shop_path, primPath=src_prim_path)
 
-        # Reference the shelf ONLY (not the full scene)
-        shelf_prim.GetReferences().AddReference(
-            Sdf.Reference(assetPath=self.empty_shop_path, primPath=src_prim_path)
-        )
+        # On reruns the payload is usually already authored; clearing and re-adding it
+        # would recompose the whole shelf subtree for nothing
+        payloads = shelf_prim.GetMetadata("payload")
+        if payloads and list(payloads.GetAddedOrExplicitItems()) == [shelf_payload]:
+            print(f"Shelf payload already set: {self.empty_shop_path}:{src_prim_path}")
+        else:
+            # Clear old arcs (including the reference earlier versions of this script
+            # authored) and add the payload as a single recomposition
+            with Sdf.ChangeBlock():
+                shelf_prim.GetReferences().ClearReferences()
+                shelf_prim.GetPayloads().ClearPayloads()
+                shelf_prim.GetPayloads().AddPayload(shelf_payload)
+            print(f"Added Shelf payload to current stage: {self.empty_shop_path}:{src_prim_path}")
 
-        print(f"Referenced Shelf into current stage: {self.empty_shop_path}:{src_prim_path}")
+        self.stage.Load(Sdf.Path(target_shelf_path), Usd.LoadWithDescendants)
 
-        # Apply optional world xform AFTER the reference is authored
+        # Apply optional world xform AFTER the payload is authored and loaded
         return self.apply_shelf_world_transform_if_enabled()
 
     # ------------------------------------------------------------------
@@ -147,12 +390,27 @@ class DynamicShopPlacer:
     # ------------------------------------------------------------------
     def load_empty_shop_sync(self):
         print("Loading empty shop environment (NEW STAGE)...")
-        success = omni.usd.get_context().open_stage(str(self.empty_shop_path))
+
+        # Open through the Kit USD context without loading any payloads and load the shelf
+        # subtree first. The shipped empty shop has no payload arcs, so this only pays off
+        # for shop files that payload their other content.
+        success = self._usd_context.open_stage(
+            self.empty_shop_path, load_set=omni.usd.UsdContextInitialLoadSet.LOAD_NONE
+        )
         if not success:
             print(f"Failed to load empty shop from: {self.empty_shop_path}")
             return False
 
-        self.stage = omni.usd.get_context().get_stage()
+        self.stage = self._usd_context.get_stage()
+        self.stage.Load(Sdf.Path("/World/Shelf"), Usd.LoadWithDescendants)
+
+        # LOAD_NONE leaves a NoneRule on the pseudo-root; restore the default load set once
+        # the shelf is loaded so payloads added elsewhere later in the session still load
+        rules = self.stage.GetLoadRules()
+        rules.AddRule(Sdf.Path.absoluteRootPath, Usd.StageLoadRules.AllRule)
+        rules.Minimize()
+        self.stage.SetLoadRules(rules)
+        self._layer = self.stage.GetEditTarget().GetLayer()
         print(f"Successfully loaded empty shop: {self.empty_shop_path}")
 
         # Even in "new stage" mode, you might still want to force a shelf world xform
@@ -165,55 +423,53 @@ class DynamicShopPlacer:
             print("ERROR: /World/Shelf does NOT exist!")
             return False
 
-        shelf_categories = {}
-        for product_id, product_data in PRODUCT_DATA.items():
-            shelf = product_data.get("shelf", "Items_Lower")
-            category = product_data.get("category", "Unknown")
-            shelf_categories.setdefault(shelf, set()).add(category)
-
-        for shelf_level, categories in shelf_categories.items():
-            shelf_path = f"/World/Shelf/{shelf_level}"
-            UsdGeom.Scope.Define(self.stage, shelf_path)
-            for category in categories:
-                category_path = f"{shelf_path}/{category}"
-                UsdGeom.Scope.Define(self.stage, category_path)
+        pairs = {
+            (product_data.get("shelf", "Items_Lower"), product_data.get("category", "Unknown"))
+            for product_data in PRODUCT_DATA.values()
+        }
+        shelves = {shelf_level for shelf_level, _ in pairs}
+
+        layer = self._layer
+        shelf_specs = {
+            shelf_level: _define_prim_spec(layer, f"/World/Shelf/{shelf_level}", "Scope")
+            for shelf_level in shelves
+        }
+        for shelf_level, category in pairs:
+            category_spec = _child_prim_spec(layer, shelf_specs[shelf_level], category, "Scope")
+            self.category_paths[(shelf_level, category)] = category_spec.path
 
         print("Created product hierarchy.")
         return True
 
+    def _category_path(self, shelf_level, category):
+        """Sdf.Path of a category scope; only the first lookup parses the path string."""
+        key = (shelf_level, category)
+        category_path = self.category_paths.get(key)
+        if category_path is None:
+            category_path = Sdf.Path(f"/World/Shelf/{shelf_level}/{category}")
+            self.category_paths[key] = category_path
+        return category_path
+
     # ------------------------------------------------------------------
-    def place_product(self, product_id, product_data):
+    def _placement_record(self, product_id, product_data):
+        """Resolve everything needed to author one product into a PlacementRecord."""
         shelf_level = product_data.get("shelf", "Items_Lower")
         category = product_data.get("category", "Unknown")
+        category_path = self._category_path(shelf_level, category)
+        sig = _placement_signature(product_data)
+        # Gf values are precomputed in load_product_data; entries added or edited since are converted here
+        xform_values = _XFORM_VALUES.get((product_id, sig)) or _xform_values(product_data)
+        return PlacementRecord(
+            product_id,
+            category_path,
+            category_path.AppendChild(product_id),
+            sig,
+            _payload_for(product_data["asset"]),
+            *xform_values,
+        )
 
-        product_path = f"/World/Shelf/{shelf_level}/{category}/{product_id}"
-        product_prim = self.stage.DefinePrim(product_path)
-        product_prim.GetPayloads().AddPayload(product_data["asset"])
-
-        xform = UsdGeom.Xform(product_prim)
-        xform.ClearXformOpOrder()
-
-        translate_op = xform.AddTranslateOp()
-        translate_op.Set(Gf.Vec3d(*product_data["translate"]))
-
-        scale_op = xform.AddScaleOp()
-        scale_op.Set(Gf.Vec3f(*product_data["scale"]))
-
-        rotation_op = None
-        if "rotate" in product_data:
-            rotation_op = xform.AddRotateZYXOp()
-            rotation_op.Set(Gf.Vec3f(*product_data["rotate"]))
-        elif "orient" in product_data:
-            rotation_op = xform.AddOrientOp()
-            q = product_data["orient"]
-            rotation_op.Set(Gf.Quatf(q[0], Gf.Vec3f(q[1], q[2], q[3])))
-
-        if rotation_op:
-            xform.SetXformOpOrder([translate_op, rotation_op, scale_op])
-        else:
-            xform.SetXformOpOrder([translate_op, scale_op])
-
-        print(f"Placed product: {product_id} at {product_data['translate']}")
+    def place_product(self, product_id, product_data, layer=None):
+        _author_product(layer or self._layer, self._placement_record(product_id, product_data))
         return True
 
     # ------------------------------------------------------------------
@@ -232,25 +488,90 @@ class DynamicShopPlacer:
         #     pd["rotate"] = random_rotation
         #     pd.pop("orient", None)
         #     randomized_data[pid] = pd
-        #     print(f"Randomized rotation for {pid}: {random_rotation}")
+        # print(f"Randomized rotations for: {selected_products}")
 
         return randomized_data
 
     # ------------------------------------------------------------------
     def place_all_products(self):
         randomized_product_data = self.randomize_product_rotations(PRODUCT_DATA, 3)
-        success_count = 0
-
-        for pid, pdata in randomized_product_data.items():
-            try:
-                if self.place_product(pid, pdata):
+        items = list(randomized_product_data.items())
+
+        # Pass 1: resolve paths, payloads and xform values for every product.
+        # Only if something is malformed do we redo it item by item to report which one.
+        try:
+            records = [self._placement_record(pid, pdata) for pid, pdata in items]
+        except Exception:
+            records = []
+            for pid, pdata in items:
+                try:
+                    records.append(self._placement_record(pid, pdata))
+                except Exception as e:
+                    print(f"Error placing {pid}: {e}")
+
+        # Sorted by path so products of the same category are authored together
+        records.sort(key=lambda record: record.product_path)
+
+        # Pass 2: tight authoring loop. Authoring is idempotent (placer_sig), so on
+        # failure the per-item retry simply skips what was already written.
+        layer = self._layer
+        try:
+            for record in records:
+                _author_product(layer, record)
+            success_count = len(records)
+        except Exception:
+            success_count = 0
+            for record in records:
+                try:
+                    _author_product(layer, record)
                     success_count += 1
-            except Exception as e:
-                print(f"Error placing {pid}: {e}")
+                except Exception as e:
+                    print(f"Error placing {record.product_id}: {e}")
 
-        print(f"Placed {success_count}/{len(randomized_product_data)} products")
+        print(f"Placed {success_count}/{len(items)} products")
         return success_count > 0
 
+    # ------------------------------------------------------------------
+    def defer_product_payloads(self):
+        """
+        Add a NoneRule to the stage load rules for every product prim that does
+        not exist yet, so its payload stays unloaded while it is being authored.
+        Returns the deferred paths for load_product_payloads().
+        """
+        rules = self.stage.GetLoadRules()
+        deferred_paths = []
+        for product_id, product_data in PRODUCT_DATA.items():
+            shelf_level = product_data.get("shelf", "Items_Lower")
+            category = product_data.get("category", "Unknown")
+            product_path = self._category_path(shelf_level, category).AppendChild(product_id)
+            if not self.stage.GetPrimAtPath(product_path):
+                rules.AddRule(product_path, Usd.StageLoadRules.NoneRule)
+                deferred_paths.append(product_path)
+
+        if deferred_paths:
+            self.stage.SetLoadRules(rules)
+        return deferred_paths
+
+    def load_product_payloads(self, deferred_paths):
+        """
+        Load all deferred product payloads in one LoadAndUnload call, which lets
+        USD compose (and fetch) them in parallel instead of one at a time.
+        """
+        load_set = {path for path in deferred_paths if self.stage.GetPrimAtPath(path)}
+        if load_set:
+            self.stage.LoadAndUnload(load_set, set(), Usd.LoadWithDescendants)
+
+        # Loading leaves one rule per product behind, and a product that was never authored
+        # (e.g. a malformed entry) would keep its NoneRule for good; drop both
+        if deferred_paths:
+            never_authored = set(deferred_paths) - load_set
+            rules = self.stage.GetLoadRules()
+            if never_authored:
+                rules.SetRules([(path, rule) for path, rule in rules.GetRules() if path not in never_authored])
+            rules.Minimize()
+            self.stage.SetLoadRules(rules)
+        print(f"Loaded payloads for {len(load_set)} new products")
+
     # ------------------------------------------------------------------
     def setup_scene_sync(self):
         print("Starting dynamic shop setup...")
@@ -264,11 +585,21 @@ class DynamicShopPlacer:
             if not self.load_empty_shop_sync():
                 return False
 
-        if not self.create_product_hierarchy():
-            return False
-
-        if not self.place_all_products():
-            return False
+        deferred_paths = self.defer_product_payloads()
+
+        # Deferred payloads are loaded even if authoring fails part way; otherwise the
+        # NoneRules would stick and those prims (which exist by the next run) stay unloaded
+        try:
+            # One change block around all product authoring: the stage (and Hydra)
+            # process a single batch of change notices when it closes
+            with Sdf.ChangeBlock():
+                if not self.create_product_hierarchy():
+                    return False
+
+                if not self.place_all_products():
+                    return False
+        finally:
+            self.load_product_payloads(deferred_paths)
 
         print("Dynamic shop setup completed successfully!")
         return True